@@ -1,14 +1,33 @@
+import asyncio
+import itertools
+import logging
 import threading
+from functools import lru_cache
 
+from aiohttp import ClientError
+from eth_account._utils.legacy_transactions import Transaction, encode_transaction
+from eth_account._utils.signing import sign_transaction_hash
+from eth_keys import keys
 from eth_typing import Address
+from eth_utils import to_canonical_address
+from hexbytes import HexBytes
 from web3 import Web3
-from web3.exceptions import TimeExhausted
+from web3.exceptions import TimeExhausted, TransactionNotFound
+from web3.logs import DISCARD
 
 from settings import (
     COMPILED_FACTORY_PATH, COMPILED_ORACLE_PATH,
-    COMPILED_CLOUD_SLA_PATH, DEBUG
+    COMPILED_CLOUD_SLA_PATH, GAS_LIMIT,
+    RECEIPT_TIMEOUT, RECEIPT_POLL_LATENCY
 )
-from utility import get_contract, check_statuses
+from utility import get_abi_functions, get_contract, check_statuses, async_batch_request, BatchNotSupported
+
+log = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=128)
+def _challenge(hash_digest: str) -> bytes:
+    return Web3.solidityKeccak(['bytes32'], [hash_digest])
 
 
 class ContractTest:
@@ -30,29 +49,237 @@ class ContractTest:
         self.factory_address = contract_addresses['Factory.sol']
         self.cloud_address = Address(cloud_address)
 
+        # Contracts
+        self.contract_factory = get_contract(self.w3, self.factory_address, COMPILED_FACTORY_PATH)
+
+        # Selectors and argument types, read after the contracts are (re)deployed
+        self.factory_functions = get_abi_functions(COMPILED_FACTORY_PATH)
+        self.cloud_sla_functions = get_abi_functions(COMPILED_CLOUD_SLA_PATH)
+        self.oracle_functions = get_abi_functions(COMPILED_ORACLE_PATH)
+
         self.accounts, self.private_keys = accounts, private_keys
+        self._signers = {pk: keys.PrivateKey(HexBytes(pk)) for pk in private_keys}
 
         self.filepaths = []
         self.tx_upload_count = tx_upload_count
         self.lock = threading.Lock()
 
+        # Local nonce counters, one for each account, and chain id: both are
+        # fetched once so that transactions are built without asking the node
+        self._supports_batch = True
+        self._needs_resync = [False] * len(self.accounts)
+        asyncio.run(self._prime_nonces())
+
     def set_cloud_sla_address(self, address: Address):
         self.cloud_address = address
 
-    async def get_nonce(self, idx: int):
-        nonce = await self.w3_async.eth.get_transaction_count(self.accounts[idx])
-        return nonce
+    async def get_nonce_lock(self, idx: int) -> int:
+        # next() on itertools.count is atomic under the GIL, so the counters
+        # can be shared by the simulation threads without holding a lock
+        if self._needs_resync[idx]:
+            await self.update_nonce(idx)
+        return next(self.nonces[idx])
 
-    async def sign_send_transaction(self, tx: dict, pk: str) -> int:
+    def _nonce_calls(self) -> []:
+        return [('eth_getTransactionCount', [account, 'pending']) for account in self.accounts]
+
+    async def _prime_nonces(self):
+        try:
+            results = await async_batch_request(self.w3_async, self._nonce_calls() + [('eth_chainId', [])])
+            *nonces, self.chain_id = [int(result, 16) for result in results]
+        except (ValueError, ClientError) as e:
+            # Errors of single calls are retried one by one, batches are
+            # disabled only if the provider does not handle them at all
+            if isinstance(e, (BatchNotSupported, ClientError)):
+                self._supports_batch = False
+            *nonces, self.chain_id = await asyncio.gather(
+                *(self.w3_async.eth.get_transaction_count(account, 'pending') for account in self.accounts),
+                self.w3_async.eth.chain_id
+            )
+        finally:
+            # Called through asyncio.run, whose loop is closed right after
+            await self.w3_async.provider.close_session()
+        self.nonces = [itertools.count(nonce) for nonce in nonces]
+
+    async def update_nonce(self, idx: int):
+        # Only this account is resynced: the counters of the others keep going
+        old_counter = self.nonces[idx]
+        new_counter = itertools.count(
+            await self.w3_async.eth.get_transaction_count(self.accounts[idx], 'pending')
+        )
+        with self.lock:
+            # Concurrent resyncs of the same account: only the first one is applied
+            if self.nonces[idx] is old_counter:
+                self.nonces[idx] = new_counter
+                self._needs_resync[idx] = False
+
+    async def _make_tx(
+            self, to: Address, function: tuple, idx: int, *args, value: int = 0, estimate_gas: bool = False
+    ) -> dict:
+        selector, types = function
+        if len(args) != len(types):
+            raise ValueError(f'{len(args)} arguments given to a function taking {len(types)}: {types}')
+        # Hex strings for bytesN arguments are what buildTransaction used to normalize
+        args = [
+            HexBytes(arg) if type_.startswith('bytes') and isinstance(arg, str) else arg
+            for type_, arg in zip(types, args)
+        ]
+        data = selector + self.w3.codec.encode_abi(types, args)
+        gas = GAS_LIMIT
+        if estimate_gas:
+            # Before the nonce is taken, so that a failed estimate does not leave a gap
+            gas = await self.w3_async.eth.estimate_gas({'from': self.accounts[idx], 'to': to, 'data': data})
+        return {
+            'to': to,
+            'data': data,
+            'value': value,
+            'gas': gas,
+            'gasPrice': 0,
+            'chainId': self.chain_id,
+            'from': self.accounts[idx],
+            'nonce': await self.get_nonce_lock(idx)
+        }
+
+    def _sign_raw(self, tx: dict, pk: str) -> bytes:
+        """
+        Sign an EIP-155 legacy transaction built by _make_tx: its fields are already
+        normalized, so the validation of Account.sign_transaction is skipped.
+        """
+        unsigned_tx = Transaction(
+            nonce=tx['nonce'],
+            gasPrice=tx['gasPrice'],
+            gas=tx['gas'],
+            to=to_canonical_address(tx['to']),
+            value=tx['value'],
+            data=tx['data'],
+            v=tx['chainId'],
+            r=0,
+            s=0
+        )
+        vrs = sign_transaction_hash(self._signers[pk], unsigned_tx.hash(), tx['chainId'])
+        return encode_transaction(unsigned_tx, vrs)
+
+    async def _sign(self, tx: dict, pk: str) -> bytes:
+        # Signing is CPU bound, keep it off the event loop
+        return await asyncio.to_thread(self._sign_raw, tx, pk)
+
+    def _flag_resync(self, pk: str):
+        # The nonce has been consumed locally but maybe not on chain: resync
+        # before the next one is handed out instead of blocking here
+        self._needs_resync[self.private_keys.index(pk)] = True
+
+    def _rejected(self, e: ValueError, pk: str):
+        print(f'{type(e)} [submit]: {e}')
+        self._flag_resync(pk)
+
+    async def _submit(self, tx: dict, pk: str):
         try:
-            signed_tx = self.w3.eth.account.sign_transaction(tx, private_key=pk)
-            tx_hash = await self.w3_async.eth.send_raw_transaction(signed_tx.rawTransaction)
-            tx_receipt = await self.w3_async.eth.wait_for_transaction_receipt(tx_hash, timeout=20)
-        except (ValueError, TimeExhausted) as e:
-            print(f'{type(e)} [sign_send]: {e}')
-            return 0
+            tx_hash = await self.w3_async.eth.send_raw_transaction(await self._sign(tx, pk))
+        except ValueError as e:
+            self._rejected(e, pk)
+            return None
+        except BaseException:
+            # Signing, transport errors, timeouts and cancellation
+            self._flag_resync(pk)
+            raise
         else:
-            return tx_receipt['status']
+            return tx_hash
+
+    async def _submit_all(self, txs: []) -> []:
+        """
+        Submit several (tx, pk) pairs, sending all the raw transactions in a single request.
+        """
+        if not self._supports_batch:
+            return await asyncio.gather(*(self._submit(tx, pk) for tx, pk in txs))
+
+        try:
+            raw_txs = await asyncio.gather(*(self._sign(tx, pk) for tx, pk in txs))
+            calls = [('eth_sendRawTransaction', [HexBytes(raw_tx).hex()]) for raw_tx in raw_txs]
+            results = await async_batch_request(self.w3_async, calls, return_exceptions=True)
+        except BatchNotSupported:
+            # Nothing has been sent: submit the transactions one by one
+            self._supports_batch = False
+            return await asyncio.gather(*(self._submit(tx, pk) for tx, pk in txs))
+        except BaseException:
+            # Any of the transactions may or may not have reached the node
+            for _, pk in txs:
+                self._flag_resync(pk)
+            raise
+
+        tx_hashes = []
+        for (_, pk), result in zip(txs, results):
+            if isinstance(result, ValueError):
+                self._rejected(result, pk)
+                tx_hashes.append(None)
+            else:
+                tx_hashes.append(HexBytes(result))
+        return tx_hashes
+
+    async def _get_receipt(self, tx_hash):
+        if tx_hash is None:
+            return None
+        try:
+            return await self.w3_async.eth.wait_for_transaction_receipt(
+                tx_hash, timeout=RECEIPT_TIMEOUT, poll_latency=RECEIPT_POLL_LATENCY
+            )
+        except TimeExhausted as e:
+            print(f'{type(e)} [get_receipt]: {e}')
+            return None
+
+    async def _await_receipt(self, tx_hash) -> int:
+        tx_receipt = await self._get_receipt(tx_hash)
+        return tx_receipt['status'] if tx_receipt is not None else 0
+
+    async def _poll_statuses(self, tx_hashes: []) -> []:
+        # Status of each transaction, None while it is not in the chain
+        if self._supports_batch:
+            calls = [('eth_getTransactionReceipt', [HexBytes(tx_hash).hex()]) for tx_hash in tx_hashes]
+            try:
+                receipts = await async_batch_request(self.w3_async, calls)
+            except BatchNotSupported:
+                self._supports_batch = False
+            else:
+                return [int(receipt['status'], 16) if receipt is not None else None for receipt in receipts]
+        return await asyncio.gather(*map(self._poll_status, tx_hashes))
+
+    async def _poll_status(self, tx_hash):
+        try:
+            return (await self.w3_async.eth.get_transaction_receipt(tx_hash))['status']
+        except TransactionNotFound:
+            return None
+
+    async def _await_receipts(self, tx_hashes: []) -> []:
+        """
+        Wait for several transactions, asking for all the pending receipts in one request per poll.
+        """
+        if len(tx_hashes) == 1:
+            return [await self._await_receipt(tx_hashes[0])]
+
+        statuses = {}
+        pending = [tx_hash for tx_hash in set(tx_hashes) if tx_hash is not None]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + RECEIPT_TIMEOUT
+        while pending:
+            for tx_hash, status in zip(pending, await self._poll_statuses(pending)):
+                if status is not None:
+                    statuses[tx_hash] = status
+            pending = [tx_hash for tx_hash in pending if tx_hash not in statuses]
+            if not pending:
+                break
+            if loop.time() >= deadline:
+                print(f'[await_receipts]: {len(pending)} transactions are not in the chain '
+                      f'after {RECEIPT_TIMEOUT} seconds')
+                break
+            await asyncio.sleep(RECEIPT_POLL_LATENCY)
+        return [statuses.get(tx_hash, 0) for tx_hash in tx_hashes]
+
+    async def sign_send_transaction(self, tx: dict, pk: str) -> int:
+        return await self._await_receipt(await self._submit(tx, pk))
+
+    async def get_sm_address(self, user: Address) -> Address:
+        data = self.contract_factory.encodeABI(fn_name='getSmartContractAddress', args=[user])
+        result = await self.w3_async.eth.call({'to': self.factory_address, 'data': data})
+        return self.w3.toChecksumAddress(self.w3.codec.decode_single('address', result))
 
     async def cloud_sla_creation_activation(self) -> tuple:
         statuses = []
@@ -61,88 +288,75 @@ class ContractTest:
         price = Web3.toWei(0.001, 'ether')  # 5
         test_validity_duration = (60 ** 2) * 24 * 7
 
-        # Contracts
-        contract_factory = get_contract(self.w3, self.factory_address, COMPILED_FACTORY_PATH)
-        contract_oracle = get_contract(self.w3, self.oracle_address, COMPILED_ORACLE_PATH)
-
         # Transactions
-        tx_create_child = contract_factory.functions.createChild(
-            contract_oracle.address,
+        tx_create_child = await self._make_tx(
+            self.factory_address, self.factory_functions['createChild'], 0,
+            self.oracle_address,
             self.accounts[1],
             price,
             test_validity_duration,
             1,
-            1
-        ).buildTransaction({
-            'gasPrice': 0,
-            'from': self.accounts[0],
-            'nonce': await self.get_nonce(0)
-        })
-        statuses.append(await self.sign_send_transaction(tx_create_child, self.private_keys[0]))
-
-        tx_sm_address = contract_factory.functions.getSmartContractAddress(
-            self.accounts[1]
-        ).call()
-
-        # Contract
-        contract_cloud_sla = get_contract(self.w3, tx_sm_address, COMPILED_CLOUD_SLA_PATH)
+            1,
+            # Deploying a CloudSLA needs more than GAS_LIMIT
+            estimate_gas=True
+        )
+        tx_receipt = await self._get_receipt(await self._submit(tx_create_child, self.private_keys[0]))
+        statuses.append(tx_receipt['status'] if tx_receipt is not None else 0)
+
+        # The address of the new CloudSLA is emitted by createChild
+        events = ()
+        if tx_receipt is not None:
+            events = self.contract_factory.events.ChildCreated().processReceipt(tx_receipt, errors=DISCARD)
+        if events:
+            tx_sm_address = events[0]['args']['childAddress']
+        else:
+            tx_sm_address = await self.get_sm_address(self.accounts[1])
 
         # Transaction
-        tx_deposit = contract_cloud_sla.functions.Deposit().buildTransaction({
-            'gasPrice': 0,
-            'from': self.accounts[1],
-            'nonce': await self.get_nonce(1),
-            'value': price
-        })
+        tx_deposit = await self._make_tx(
+            tx_sm_address, self.cloud_sla_functions['Deposit'], 1,
+            value=price
+        )
         statuses.append(await self.sign_send_transaction(tx_deposit, self.private_keys[1]))
 
         all_statuses = check_statuses(statuses)
 
-        if all_statuses and DEBUG:
-            print('CloudSLA creation and activation: OK')
-            print(f'\taddress: {tx_sm_address}')
+        if all_statuses:
+            log.debug('CloudSLA creation and activation: OK\n\taddress: %s', tx_sm_address)
 
         return tx_sm_address, all_statuses
 
     async def sequence_upload(self, filepath: str, hash_digest: str) -> bool:
         statuses = []
 
-        # Contract
-        contract_cloud_sla = get_contract(self.w3, self.cloud_address, COMPILED_CLOUD_SLA_PATH)
-
         # Transactions
-        challenge = Web3.solidityKeccak(
-            ['bytes32'], [hash_digest]
-        )
+        challenge = _challenge(hash_digest)
 
-        tx_upload_request = contract_cloud_sla.functions.UploadRequest(
+        tx_upload_request = await self._make_tx(
+            self.cloud_address, self.cloud_sla_functions['UploadRequest'], 1,
             filepath,
             challenge
-        ).buildTransaction({
-            'gasPrice': 0,
-            'from': self.accounts[1],
-            'nonce': await self.get_nonce(1)
-        })
+        )
         statuses.append(await self.sign_send_transaction(tx_upload_request, self.private_keys[1]))
 
-        tx_upload_request_ack = contract_cloud_sla.functions.UploadRequestAck(
+        # Both acks are sent by the cloud, so they are mined in nonce order
+        # and can be submitted together once the request is on chain
+        tx_upload_request_ack = await self._make_tx(
+            self.cloud_address, self.cloud_sla_functions['UploadRequestAck'], 0,
             filepath
-        ).buildTransaction({
-            'gasPrice': 0,
-            'from': self.accounts[0],
-            'nonce': await self.get_nonce(0)
-        })
-        statuses.append(await self.sign_send_transaction(tx_upload_request_ack, self.private_keys[0]))
+        )
 
-        tx_upload_transfer_ack = contract_cloud_sla.functions.UploadTransferAck(
+        tx_upload_transfer_ack = await self._make_tx(
+            self.cloud_address, self.cloud_sla_functions['UploadTransferAck'], 0,
             filepath,
             hash_digest
-        ).buildTransaction({
-            'gasPrice': 0,
-            'from': self.accounts[0],
-            'nonce': await self.get_nonce(0)
-        })
-        statuses.append(await self.sign_send_transaction(tx_upload_transfer_ack, self.private_keys[0]))
+        )
+
+        tx_hashes = await self._submit_all([
+            (tx_upload_request_ack, self.private_keys[0]),
+            (tx_upload_transfer_ack, self.private_keys[0])
+        ])
+        statuses.extend(await self._await_receipts(tx_hashes))
 
         all_statuses = check_statuses(statuses)
 
@@ -151,27 +365,18 @@ class ContractTest:
     async def sequence_read(self, filepath: str, url: str) -> bool:
         statuses = []
 
-        # Contract
-        contract_cloud_sla = get_contract(self.w3, self.cloud_address, COMPILED_CLOUD_SLA_PATH)
-
         # Transactions
-        tx_read_request = contract_cloud_sla.functions.ReadRequest(
+        tx_read_request = await self._make_tx(
+            self.cloud_address, self.cloud_sla_functions['ReadRequest'], 1,
             filepath
-        ).buildTransaction({
-            'gasPrice': 0,
-            'from': self.accounts[1],
-            'nonce': await self.get_nonce(1)
-        })
+        )
         statuses.append(await self.sign_send_transaction(tx_read_request, self.private_keys[1]))
 
-        tx_read_request_ack = contract_cloud_sla.functions.ReadRequestAck(
+        tx_read_request_ack = await self._make_tx(
+            self.cloud_address, self.cloud_sla_functions['ReadRequestAck'], 0,
             filepath,
             url
-        ).buildTransaction({
-            'gasPrice': 0,
-            'from': self.accounts[0],
-            'nonce': await self.get_nonce(0)
-        })
+        )
         statuses.append(await self.sign_send_transaction(tx_read_request_ack, self.private_keys[0]))
 
         all_statuses = check_statuses(statuses)
@@ -181,37 +386,24 @@ class ContractTest:
     async def sequence_file(self, filepath: str, url: str, hash_digest: str) -> bool:
         statuses = []
 
-        # Contracts
-        contract_cloud_sla = get_contract(self.w3, self.cloud_address, COMPILED_CLOUD_SLA_PATH)
-        contract_oracle = get_contract(self.w3, self.oracle_address, COMPILED_ORACLE_PATH)
-
         # Transactions
-        tx_file_hash_request = contract_cloud_sla.functions.FileHashRequest(
+        tx_file_hash_request = await self._make_tx(
+            self.cloud_address, self.cloud_sla_functions['FileHashRequest'], 1,
             filepath
-        ).buildTransaction({
-            'gasPrice': 0,
-            'from': self.accounts[1],
-            'nonce': await self.get_nonce(1)
-        })
+        )
         statuses.append(await self.sign_send_transaction(tx_file_hash_request, self.private_keys[1]))
 
-        tx_digit_store = contract_oracle.functions.DigestStore(
+        tx_digit_store = await self._make_tx(
+            self.oracle_address, self.oracle_functions['DigestStore'], 2,
             url,
             hash_digest
-        ).buildTransaction({
-            'gasPrice': 0,
-            'from': self.accounts[2],
-            'nonce': await self.get_nonce(2)
-        })
+        )
         statuses.append(await self.sign_send_transaction(tx_digit_store, self.private_keys[2]))
 
-        tx_file_check = contract_cloud_sla.functions.FileCheck(
+        tx_file_check = await self._make_tx(
+            self.cloud_address, self.cloud_sla_functions['FileCheck'], 1,
             filepath
-        ).buildTransaction({
-            'gasPrice': 0,
-            'from': self.accounts[1],
-            'nonce': await self.get_nonce(1)
-        })
+        )
         statuses.append(await self.sign_send_transaction(tx_file_check, self.private_keys[1]))
 
         all_statuses = check_statuses(statuses)
@@ -228,8 +420,8 @@ class ContractTest:
 
         all_statuses = await self.sequence_upload(filepath, hash_digest)
 
-        if all_statuses and DEBUG:
-            print('Upload: OK')
+        if all_statuses:
+            log.debug('Upload: OK')
 
         return all_statuses
 
@@ -239,8 +431,8 @@ class ContractTest:
         url = f'www.{filepath}.com'
 
         all_statuses = await self.sequence_read(filepath, url)
-        if all_statuses and DEBUG:
-            print('Read: OK')
+        if all_statuses:
+            log.debug('Read: OK')
 
         return all_statuses
 
@@ -253,32 +445,23 @@ class ContractTest:
         filepath = f'test{self.tx_upload_count}.pdf'
         self.lock.release()
 
-        # Contract
-        contract_cloud_sla = get_contract(self.w3, self.cloud_address, COMPILED_CLOUD_SLA_PATH)
-
         # Transactions
-        tx_delete_request = contract_cloud_sla.functions.DeleteRequest(
+        tx_delete_request = await self._make_tx(
+            self.cloud_address, self.cloud_sla_functions['DeleteRequest'], 1,
             filepath
-        ).buildTransaction({
-            'gasPrice': 0,
-            'from': self.accounts[1],
-            'nonce': await self.get_nonce(1)
-        })
+        )
         statuses.append(await self.sign_send_transaction(tx_delete_request, self.private_keys[1]))
 
-        tx_delete = contract_cloud_sla.functions.Delete(
+        tx_delete = await self._make_tx(
+            self.cloud_address, self.cloud_sla_functions['Delete'], 0,
             filepath
-        ).buildTransaction({
-            'gasPrice': 0,
-            'from': self.accounts[0],
-            'nonce': await self.get_nonce(0)
-        })
+        )
         statuses.append(await self.sign_send_transaction(tx_delete, self.private_keys[0]))
 
         all_statuses = check_statuses(statuses)
 
-        if all_statuses and DEBUG:
-            print('Delete: OK')
+        if all_statuses:
+            log.debug('Delete: OK')
 
         return all_statuses
 
@@ -290,8 +473,8 @@ class ContractTest:
 
         all_statuses = await self.sequence_file(filepath, url, hash_digest)
 
-        if all_statuses and DEBUG:
-            print('File check for undeleted file: OK')
+        if all_statuses:
+            log.debug('File check for undeleted file: OK')
 
         return all_statuses
 
@@ -305,8 +488,8 @@ class ContractTest:
 
         all_statuses = await self.sequence_upload(filepath, hash_digest)
 
-        if all_statuses and DEBUG:
-            print('Another file upload: OK')
+        if all_statuses:
+            log.debug('Another file upload: OK')
 
         return all_statuses
 
@@ -316,32 +499,23 @@ class ContractTest:
         # Parameter
         filepath = f'test{self.tx_upload_count - 1}.pdf'
 
-        # Contract
-        contract_cloud_sla = get_contract(self.w3, self.cloud_address, COMPILED_CLOUD_SLA_PATH)
-
         # Transactions
-        tx_read_request = contract_cloud_sla.functions.ReadRequest(
+        tx_read_request = await self._make_tx(
+            self.cloud_address, self.cloud_sla_functions['ReadRequest'], 1,
             filepath
-        ).buildTransaction({
-            'gasPrice': 0,
-            'from': self.accounts[1],
-            'nonce': await self.get_nonce(1)
-        })
+        )
         statuses.append(await self.sign_send_transaction(tx_read_request, self.private_keys[1]))
 
-        tx_read_request_deny = contract_cloud_sla.functions.ReadRequestDeny(
+        tx_read_request_deny = await self._make_tx(
+            self.cloud_address, self.cloud_sla_functions['ReadRequestDeny'], 0,
             filepath
-        ).buildTransaction({
-            'gasPrice': 0,
-            'from': self.accounts[0],
-            'nonce': await self.get_nonce(0)
-        })
+        )
         statuses.append(await self.sign_send_transaction(tx_read_request_deny, self.private_keys[0]))
 
         all_statuses = check_statuses(statuses)
 
-        if all_statuses and DEBUG:
-            print('Read Deny with lost file check: OK')
+        if all_statuses:
+            log.debug('Read Deny with lost file check: OK')
 
         return all_statuses
 
@@ -360,8 +534,8 @@ class ContractTest:
 
         all_statuses_read = await self.sequence_read(filepath, url)
 
-        if all_statuses_upload and all_statuses_read and DEBUG:
-            print('Another file upload + read: OK')
+        if all_statuses_upload and all_statuses_read:
+            log.debug('Another file upload + read: OK')
 
         return all_statuses_upload and all_statuses_read
 
@@ -373,7 +547,7 @@ class ContractTest:
 
         all_statuses = await self.sequence_file(filepath, url, hash_digest)
 
-        if all_statuses and DEBUG:
-            print('File Check for corrupted file: OK')
+        if all_statuses:
+            log.debug('File Check for corrupted file: OK')
 
         return all_statuses
@@ -2,6 +2,7 @@ import asyncio
 
 import argparse
 import json
+import logging
 import os
 import threading
 from datetime import datetime
@@ -21,6 +22,7 @@ def between_callback(process_count: int, fn: str):
     asyncio.set_event_loop(loop)
     func_to_run = fn + '()'
     df_to_append = loop.run_until_complete(get_time(func_to_run, process_count))
+    loop.run_until_complete(client.w3_async.provider.close_session())
     loop.close()
     df = pd.concat([df, df_to_append], ignore_index=True)
 
@@ -89,6 +91,7 @@ async def main():
 
     for j in jobs:
         j.join()
+    await client.w3_async.provider.close_session()
 
     if DEBUG:
         print(df)
@@ -190,6 +193,9 @@ if __name__ == '__main__':
         if args.experiment == 'none':
             parser.error("specify the experiment folder for the output file")
 
+    logging.basicConfig(format='%(message)s')
+    logging.getLogger('contract_functions').setLevel(logging.DEBUG if DEBUG else logging.INFO)
+
     zero_time = datetime.now()
     df = pd.DataFrame()
     client = Web3Client(args.blockchain)
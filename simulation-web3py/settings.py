@@ -15,6 +15,13 @@ RESULTS_CSV_DIR = 'results'
 
 DEPLOYED_CONTRACTS = 40
 
+# Gas supplied to the CloudSLA transactions, so that web3 does not estimate it
+GAS_LIMIT = 3_000_000
+
+# Seconds to wait for transaction receipts and between two polls
+RECEIPT_TIMEOUT = 20
+RECEIPT_POLL_LATENCY = 0.1
+
 __QUORUM_PATH = '../quorum/src/private_keys.json'
 with open(__QUORUM_PATH) as file:
     quorum_private_keys = json.loads(file.read())['privatekey']
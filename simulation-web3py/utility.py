@@ -1,8 +1,10 @@
 import json
 import os
 from argparse import ArgumentTypeError
+from functools import lru_cache
 
 from eth_typing import Address
+from eth_utils import function_abi_to_4byte_selector
 from web3.contract import Contract
 
 from settings import MIN_VAL, MAX_VAL, DEPLOYED_CONTRACTS, CONFIG_DIR
@@ -51,19 +53,91 @@ def get_credentials(blockchain: str) -> tuple:
     return quorum_private_keys
 
 
-def get_contract(w3, address: Address, compiled_contract_path: str) -> Contract:
-    def get_abi(path: str) -> list:
-        with open(path) as file:
-            contract_json = json.load(file)
-            contract_abi = contract_json['abi']
-        return contract_abi
+@lru_cache(maxsize=None)
+def get_abi(path: str) -> list:
+    with open(path) as file:
+        contract_json = json.load(file)
+        contract_abi = contract_json['abi']
+    return contract_abi
+
+
+@lru_cache(maxsize=None)
+def get_contract_factory(w3, compiled_contract_path: str) -> type:
+    # Shared by every ContractTest: the ABI is normalized once per contract type
+    return w3.eth.contract(abi=get_abi(compiled_contract_path))
 
-    abi = get_abi(compiled_contract_path)
-    contract = w3.eth.contract(address=address, abi=abi)
+
+@lru_cache(maxsize=None)
+def get_abi_functions(compiled_contract_path: str) -> dict:
+    """
+    Map each function name of a compiled contract to its selector and argument types.
+    """
+    functions = {}
+    for fn_abi in get_abi(compiled_contract_path):
+        if fn_abi['type'] == 'function':
+            types = [arg['type'] for arg in fn_abi['inputs']]
+            functions[fn_abi['name']] = (function_abi_to_4byte_selector(fn_abi), types)
+    return functions
+
+
+def clear_abi_caches():
+    # The compiled contracts are rewritten on deploy
+    get_abi.cache_clear()
+    get_contract_factory.cache_clear()
+    get_abi_functions.cache_clear()
+
+
+def get_contract(w3, address: Address, compiled_contract_path: str) -> Contract:
+    contract = get_contract_factory(w3, compiled_contract_path)(address)
 
     return contract
 
 
+class BatchNotSupported(ValueError):
+    """
+    The provider answered a JSON-RPC batch with something other than a list.
+    """
+
+
+def encode_batch(calls: []) -> bytes:
+    batch = [
+        {'jsonrpc': '2.0', 'method': method, 'params': params, 'id': idx}
+        for idx, (method, params) in enumerate(calls)
+    ]
+    return json.dumps(batch).encode()
+
+
+def decode_batch(raw_response: bytes, calls_count: int, return_exceptions: bool = False) -> []:
+    responses = json.loads(raw_response)
+    if not isinstance(responses, list):
+        raise BatchNotSupported(f'batch not supported: {responses}')
+    if len(responses) != calls_count:
+        raise ValueError(f'{len(responses)} responses to a batch of {calls_count} calls: {responses}')
+    # Errors for requests that could not be parsed have id null
+    responses_by_id = {response.get('id'): response for response in responses}
+    results = []
+    for idx in range(calls_count):
+        response = responses_by_id.get(idx)
+        if response is None:
+            raise ValueError(f'no response to call {idx} of the batch: {responses}')
+        if 'error' not in response:
+            results.append(response['result'])
+        elif return_exceptions:
+            results.append(ValueError(response['error']))
+        else:
+            raise ValueError(response['error'])
+    return results
+
+
+async def async_batch_request(w3_async, calls: [], return_exceptions: bool = False) -> []:
+    """
+    Send independent JSON-RPC calls, given as (method, params), in a single POST.
+    With return_exceptions, failed calls are returned as ValueError instead of raised.
+    """
+    raw_response = await w3_async.provider.post(encode_batch(calls))
+    return decode_batch(raw_response, len(calls), return_exceptions)
+
+
 def check_statuses(statuses: []) -> bool:
     for idx in range(len(statuses)):
         if statuses[idx] == 0:
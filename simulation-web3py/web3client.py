@@ -1,20 +1,63 @@
+import asyncio
 import json
 import os
+import threading
 
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
 from eth_typing import ChecksumAddress, Address
 from semantic_version import Version
 from solcx import install_solc, set_solc_version, compile_files, get_installed_solc_versions
 from web3 import Web3, AsyncHTTPProvider, HTTPProvider
 from web3.eth import AsyncEth
+from web3.types import RPCEndpoint, RPCResponse
 
 from settings import HTTP_URI, SOLC_VERSION, CONFIG_DIR
-from utility import get_credentials
+from utility import get_credentials, clear_abi_caches
+
+
+class SessionAsyncHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider that keeps one aiohttp session, without connection limits,
+    for each event loop instead of opening a new session for every request.
+    """
+
+    def __init__(self, endpoint_uri: str):
+        super().__init__(endpoint_uri)
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+
+    def _get_session(self) -> ClientSession:
+        loop = asyncio.get_running_loop()
+        with self._sessions_lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                connector = TCPConnector(limit=0, limit_per_host=0, keepalive_timeout=60)
+                session = ClientSession(connector=connector, raise_for_status=True)
+                self._sessions[loop] = session
+        return session
+
+    async def close_session(self):
+        # Sessions are bound to their loop: close it before the loop is closed
+        with self._sessions_lock:
+            session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+    async def post(self, data: bytes) -> bytes:
+        kwargs = self.get_request_kwargs()
+        kwargs.setdefault('timeout', ClientTimeout(10))
+        async with self._get_session().post(self.endpoint_uri, data=data, **kwargs) as response:
+            return await response.read()
+
+    async def make_request(self, method: RPCEndpoint, params) -> RPCResponse:
+        raw_response = await self.post(self.encode_rpc_request(method, params))
+        return self.decode_rpc_response(raw_response)
 
 
 class Web3Client:
     def __init__(self, blockchain: str):
         self.w3_async = Web3(
-            AsyncHTTPProvider(HTTP_URI),
+            SessionAsyncHTTPProvider(HTTP_URI),
             modules={
                 'eth': AsyncEth
             },
@@ -53,6 +96,7 @@ class Web3Client:
         filepath = os.path.join(os.getcwd(), CONFIG_DIR, filename)
         with open(filepath, 'w') as file:
             json.dump(summary, file, indent=4)
+        clear_abi_caches()
         print('Deploy completed.')
         print(f'Config file saved to {filepath}')
         self.status_init = True